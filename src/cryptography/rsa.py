@@ -1,10 +1,27 @@
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
-import base64
+import threading
+import functools
+import tempfile
 import os
 
 
+# Shared hash/padding instances for RSA-OAEP. OpenSSL dispatches SHA-256 to the CPU's SHA
+# extensions (SHA-NI / ARMv8 SHA2) at runtime, as long as it was not built with no-asm
+_SHA256 = hashes.SHA256()
+_OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=_SHA256), algorithm=_SHA256, label=None)
+
+# Loaded key objects per key file path, stored as (mtime, key) and reloaded on mtime change
+_pub_key_cache = {}
+_priv_key_cache = {}
+
+# Background key generation events per role, set once the role's key pair is on disk
+_keygen_events = {}
+_keygen_lock = threading.Lock()
+
+
 def get_keys_path(role):
     # Get the current directory of the script
     keys_dir = os.path.join(os.getcwd(), f"keys/{role.decode()}")
@@ -15,51 +32,160 @@ def get_keys_path(role):
     return keys_dir
 
 
-def generate_rsa_key_pair(role) -> None:
-    path = get_keys_path(role)
+def _private_key_pem(key) -> bytes:
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
 
-    if not os.path.exists(os.path.join(path, "public_key.pem")):
-        # Save private and public rsa keys to files
-        with open(os.path.join(path, "private_key.pem"), "wb") as f:
-            key = rsa.generate_private_key(
-                public_exponent=65537, key_size=2048, backend=default_backend()
-            )
 
-            f.write(
-                key.private_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PrivateFormat.PKCS8,
-                    encryption_algorithm=serialization.NoEncryption(),
-                )
-            )
+def _public_key_pem(key) -> bytes:
+    return key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
 
-        with open(os.path.join(path, "public_key.pem"), "wb") as f:
-            f.write(
-                key.public_key().public_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PublicFormat.SubjectPublicKeyInfo,
-                )
+def _write_temp_file(path, data: bytes) -> str:
+    """Write data to a fully flushed temp file in path, to be published with link/replace"""
+    fd, temp_path = tempfile.mkstemp(dir=path, suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    return temp_path
+
+
+def _read_private_key(private_path):
+    """Load a private key file, None if it is unreadable (e.g. left empty by an interrupted run)"""
+    try:
+        with open(private_path, "rb") as f:
+            return serialization.load_pem_private_key(
+                f.read(), backend=default_backend(), password=None
             )
+    except ValueError:
+        return None
 
 
-def load_public_key(role):
+def generate_rsa_key_pair(role) -> None:
     path = get_keys_path(role)
-    path = os.path.join(path, "public_key.pem")
-    generate_rsa_key_pair(role)
+    private_path = os.path.join(path, "private_key.pem")
+    public_path = os.path.join(path, "public_key.pem")
 
-    with open(path, "rb") as f:
-        return serialization.load_pem_public_key(f.read(), backend=default_backend())
+    key = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048, backend=default_backend()
+    )
 
+    # Write the key in full before publishing, so readers never see a partial PEM
+    private_temp = _write_temp_file(path, _private_key_pem(key))
+    public_temp = None
 
-def load_private_key(role):
-    path = get_keys_path(role)
-    path = os.path.join(path, "private_key.pem")
-    generate_rsa_key_pair(role)
+    try:
+        try:
+            # Exclusive create: only one process gets to publish its private key
+            os.link(private_temp, private_path)
+        except FileExistsError:
+            if _read_private_key(private_path) is None:
+                os.replace(private_temp, private_path)
+        except OSError:
+            # No hard links on this filesystem, fall back to a non-exclusive replace
+            os.replace(private_temp, private_path)
+
+        # Derive the public key from whichever private key ended up on disk
+        public_temp = _write_temp_file(
+            path, _public_key_pem(_read_private_key(private_path))
+        )
+        os.replace(public_temp, public_path)
+
+    finally:
+        for temp_path in (private_temp, public_temp):
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def generate_rsa_key_pair_async(role) -> threading.Event:
+    """
+    Start generating the key pair for a role on a background thread so that the (slow) 2048-bit
+    keygen overlaps with node startup. Key loading waits on the returned event.
+    """
+    public_path = os.path.join(get_keys_path(role), "public_key.pem")
+
+    with _keygen_lock:
+        if role not in _keygen_events:
+            event = threading.Event()
+
+            def generate():
+                try:
+                    # The public key is published last, so the pair is complete once it exists
+                    if not os.path.exists(public_path):
+                        generate_rsa_key_pair(role)
+                finally:
+                    event.set()
+
+            _keygen_events[role] = event
+            threading.Thread(target=generate, daemon=True).start()
+
+        return _keygen_events[role]
+
+
+def _load_cached_key(cache, role, file_name, loader):
+    path = os.path.join(get_keys_path(role), file_name)
+
+    keygen_event = _keygen_events.get(role)
+    if keygen_event is not None:
+        keygen_event.wait()
+
+    try:
+        key_mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        generate_rsa_key_pair(role)
+        key_mtime = os.stat(path).st_mtime
+
+    cached = cache.get(path)
+    if cached is not None and cached[0] == key_mtime:
+        return cached[1]
 
     with open(path, "rb") as f:
-        return serialization.load_pem_private_key(
-            f.read(), backend=default_backend(), password=None
-        )
+        key = loader(f.read())
+
+    cache[path] = (key_mtime, key)
+    return key
+
+
+def load_public_key(role):
+    return _load_cached_key(
+        _pub_key_cache,
+        role,
+        "public_key.pem",
+        lambda key_bytes: serialization.load_pem_public_key(
+            key_bytes, backend=default_backend()
+        ),
+    )
+
+
+def load_private_key(role):
+    # Our own generated keys can skip the (slow) RSA key consistency check on load,
+    # enabled with TENSORLINK_TRUSTED_KEYS=1
+    trusted = os.getenv("TENSORLINK_TRUSTED_KEYS") == "1"
+
+    return _load_cached_key(
+        _priv_key_cache,
+        role,
+        "private_key.pem",
+        lambda key_bytes: serialization.load_pem_private_key(
+            key_bytes,
+            backend=default_backend(),
+            password=None,
+            unsafe_skip_rsa_key_validation=trusted,
+        ),
+    )
 
 
 def authenticate_public_key(public_key) -> bool:
@@ -102,6 +228,12 @@ def get_public_key_obj(public_key_bytes):
     )
 
 
+@functools.lru_cache(maxsize=128)
+def _get_cached_public_key_obj(public_key_bytes: bytes):
+    # Peers' keys are re-sent on every handshake, avoid re-parsing the same PEM
+    return get_public_key_obj(public_key_bytes)
+
+
 def get_private_key_obj(private_key_bytes):
     return serialization.load_pem_private_key(
         private_key_bytes, backend=default_backend(), password=None
@@ -127,34 +259,35 @@ def get_rsa_priv_key(role, b=False):
 
 
 def encrypt(data, role, pub_key: bytes = None):
-    # Encrypt the data using RSA-OAEP
+    """
+    Hybrid encryption: the data is encrypted with a random AES-256-GCM key, and only that
+    key is encrypted with RSA-OAEP. Output is wrapped_key || nonce || ciphertext.
+    """
     if pub_key is None:
         pub_key = get_rsa_pub_key(role)
     else:
-        pub_key = get_public_key_obj(pub_key)
-
-    encrypted_data = pub_key.encrypt(
-        data,
-        padding.OAEP(
-            mgf=padding.MGF1(algorithm=hashes.SHA256()),
-            algorithm=hashes.SHA256(),
-            label=None,
-        ),
-    )
+        pub_key = _get_cached_public_key_obj(pub_key)
+
+    key = os.urandom(32)
+    nonce = os.urandom(12)
 
-    return base64.b64encode(encrypted_data)
+    wrapped_key = pub_key.encrypt(key, _OAEP)
+    encrypted_data = AESGCM(key).encrypt(nonce, data, None)
+
+    return wrapped_key + nonce + encrypted_data
 
 
 def decrypt(data, role):
     private_key = get_rsa_priv_key(role)
 
-    decrypted_data = private_key.decrypt(
-        base64.b64decode(data),
-        padding.OAEP(
-            mgf=padding.MGF1(algorithm=hashes.SHA256()),
-            algorithm=hashes.SHA256(),
-            label=None,
-        ),
+    key_len = private_key.key_size // 8
+    wrapped_key, nonce, encrypted_data = (
+        data[:key_len],
+        data[key_len : key_len + 12],
+        data[key_len + 12 :],
     )
 
+    key = private_key.decrypt(wrapped_key, _OAEP)
+    decrypted_data = AESGCM(key).decrypt(nonce, encrypted_data, None)
+
     return decrypted_data
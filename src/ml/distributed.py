@@ -14,9 +14,31 @@ import time
 
 
 MAX_WAIT_TIME = 3
+MAX_RESPONSE_TIME = 300
 THREAD_STORAGE = threading.local()
 
 
+def wait_for_response(response_queue: queue.Queue, node: TorchNode):
+    """
+    Block until a response arrives on the queue, polling every MAX_WAIT_TIME seconds so we
+    give up once the node is shutting down or no response arrived within MAX_RESPONSE_TIME.
+    """
+    start_time = time.time()
+
+    while True:
+        try:
+            return response_queue.get(timeout=MAX_WAIT_TIME)
+        except queue.Empty:
+            # Logic here to request another worker take his place
+            if node.terminate_flag.is_set():
+                raise RuntimeError("node stopped while waiting for a response")
+
+            if time.time() - start_time > MAX_RESPONSE_TIME:
+                raise TimeoutError(
+                    f"no response received within {MAX_RESPONSE_TIME} seconds"
+                )
+
+
 def contains_offloaded(module: nn.Module):
     if not list(module.named_children()):
         return False
@@ -171,9 +193,6 @@ class DistributedModel(nn.Module):
                     connection = self.master_node.distributed_graph[module_id]
 
                     # If there are remaining computations between output and last submodule
-                    start_time = time.time()
-                    n_queued = self.model.backward_queues[micro].qsize()
-
                     if loss.grad_fn is not None:
                         loss.backward()
                         self.master_node.send_backward(
@@ -182,12 +201,10 @@ class DistributedModel(nn.Module):
                     else:
                         self.master_node.send_backward(connection, loss, context=tag)
 
-                    while not self.model.backward_queues[micro].qsize() <= n_queued:
-                        if time.time() - start_time >= MAX_WAIT_TIME:
-                            # Logic here to request another worker take his place
-                            pass
-
-                    loss = self.model.backward_queues[micro].get()[-1]
+                    # Block until the backward response arrives
+                    loss = wait_for_response(
+                        self.model.backward_queues[micro], self.master_node
+                    )[-1]
 
             elif len(vals) == 1:
                 assoc_input = vals[0]
@@ -470,10 +487,8 @@ class OffloadedModule(nn.Module):
             pass
 
     def forward(self, *args, **kwargs):
-        start_time = time.time()
         n_iter = self.master_node.modules["Master"].n_batch
         n_micro = getattr(THREAD_STORAGE, "micro", None)
-        n_queued = self.master_node.modules["Master"].forward_queues[n_micro].qsize()
 
         tag = [n_iter, n_micro, self.module_id]
 
@@ -485,17 +500,10 @@ class OffloadedModule(nn.Module):
         # Relay forward pass to next node
         self.master_node.send_forward(self.worker_node, (args, kwargs), context=tag)
 
-        # Wait for response, change to appending waiting thread to list in master
-        while (
-            self.master_node.modules["Master"].forward_queues[n_micro].qsize()
-            <= n_queued
-        ):
-            if time.time() - start_time >= MAX_WAIT_TIME:
-                # Logic here to request another worker take his place
-                pass
-
-        # Grab returned tensor
-        _, output = self.master_node.modules["Master"].forward_queues[n_micro].get()
+        # Block until the returned tensor arrives, the receiving thread wakes us via the queue
+        _, output = wait_for_response(
+            self.master_node.modules["Master"].forward_queues[n_micro], self.master_node
+        )
 
         inter_storage = [
             self.module_id,
@@ -1,30 +1,10 @@
 from transformers import BertModel, AutoModelForCausalLM
-from torchviz import make_dot
 import torch.nn as nn
 import networkx as nx
 import torch
-import random
 import re
 
 
-def parse_node(node):
-    id = node.split()[0]
-    name = node.split("label=")[-1]
-    if name[0] == "\"":
-        name = name.split("\"", maxsplit=2)[1].strip()
-    if name[-1] == "]":
-        name = name[:-1]
-    return id, name
-
-
-def parse_edge(edge):
-    arrow_idx = edge.find("->")
-    if arrow_idx != -1:
-        left_num = edge[:arrow_idx].strip()
-        right_num = edge[arrow_idx + 2:].strip().split()[0]
-        return left_num, right_num
-
-
 def handle_output(tensor):
     if hasattr(tensor, "last_hidden_state"):
         tensor = tensor.last_hidden_state
@@ -34,18 +14,34 @@ def handle_output(tensor):
 
 
 def create_graph(module: nn.Module, dummy_input: torch.Tensor):
+    """
+    Build the autograd graph of a forward pass by walking grad_fn directly. Nodes are keyed
+    by id of their backward function and named after its type (or parameter name for leaves).
+    """
     out = handle_output(module(dummy_input))
+    param_names = {id(param): name for name, param in module.named_parameters()}
+
+    nodes = {}
+    edges = []
+    functions = {}  # Keeps visited functions alive so their ids stay unique
+
+    stack = [out.grad_fn] if out.grad_fn is not None else []
+    while stack:
+        fn = stack.pop()
+        if id(fn) in functions:
+            continue
 
-    dot = make_dot(out, params=dict(list(module.named_parameters())))
-    dot.render(str(round(random.random(), 2)))
+        functions[id(fn)] = fn
+        variable = getattr(fn, "variable", None)
+        if variable is not None and id(variable) in param_names:
+            nodes[id(fn)] = param_names[id(variable)]
+        else:
+            nodes[id(fn)] = type(fn).__name__
 
-    dot_string = dot.source
-    lines = dot_string.replace("\n", "").split("\t")
-    nodes = [line.strip() for line in lines if "label=" in line]
-    nodes = [parse_node(node) for node in nodes]
-    nodes = {node[0]: node[1] for node in nodes}
-    edges = [line.strip() for line in lines if "->" in line]
-    edges = [parse_edge(edge) for edge in edges]
+        for next_fn, _ in fn.next_functions:
+            if next_fn is not None:
+                edges.append((id(next_fn), id(fn)))
+                stack.append(next_fn)
 
     return nodes, edges
 
@@ -1,25 +1,24 @@
 import torch.nn as nn
-import inspect
+import functools
 import torch
-import ast
 
 
 distributed_module_ids = []
 
 
+@functools.lru_cache(maxsize=None)
+def get_device_memory(device: int) -> int:
+    # Total capacity is fixed for the lifetime of the process, so query each device once
+    return torch.cuda.get_device_properties(device).total_memory
+
+
 def get_gpu_memory():
     # Check how much available memory we can allocate to the node
     memory = 0
 
     if torch.cuda.is_available():
-        devices = list(range(torch.cuda.device_count()))
-        memory += torch.cuda.memory
-
-        for device in devices:
-            torch.cuda.set_device(device)
-            memory_stats = torch.cuda.memory_stats(device)
-            device_memory = memory_stats["allocated_bytes.all.peak"] / 1024 / 1024
-            memory += device_memory
+        for device in range(torch.cuda.device_count()):
+            memory += get_device_memory(device)
     else:
         # TODO CPU should be able to handle 1 GB (temporary fix)
         memory += 1.37e9
@@ -58,6 +57,35 @@ def estimate_memory(module):
     )
 
 
+def estimate_memory_tree(module) -> dict:
+    """
+    Same estimate as estimate_memory, for a module and all of its submodules in a single
+    bottom-up pass. Returns a dict keyed by module. Tied or shared parameters are counted
+    once per subtree, as in module.parameters().
+    """
+    memory = {}
+
+    # Unique parameter sizes per visited module, keyed by id(param)
+    params = {}
+
+    def visit(mod):
+        sizes = {
+            id(param): param.numel() * param.element_size()
+            for param in mod.parameters(recurse=False)
+        }
+
+        for child in mod.children():
+            if child not in params:
+                visit(child)
+            sizes.update(params[child])
+
+        params[mod] = sizes
+        memory[mod] = 4 * sum(sizes.values())
+
+    visit(module)
+    return memory
+
+
 def estimate_memory_requirement(layer, dummy_input: torch.Tensor, optimizer):
     layer.eval()
     output = handle_output(layer(dummy_input.detach()))
@@ -1,11 +1,24 @@
 import hashlib
-from typing import Union
 import socket
+import struct
 import time
 import threading
 import json
 import zlib
-import base64
+
+
+# Message header: flags (1 byte) + payload length (8 bytes, big-endian)
+HEADER = struct.Struct(">BQ")
+FLAG_COMPRESSED = 0x01
+
+# Max number of buffers per sendmsg call
+IOV_MAX = 1024
+
+# Largest payload length accepted from a header, larger messages are treated as corrupt
+MAX_MESSAGE_SIZE = 16 * 1024**3
+
+# Initial receive buffer size, larger messages grow the buffer as their data arrives
+RECV_BUFFER_SIZE = 64 * 1024**2
 
 
 class Connection(threading.Thread):
@@ -30,124 +43,144 @@ class Connection(threading.Thread):
         self.main_node = main_node
         self.sock = sock
         self.terminate_flag = threading.Event()
+        self.send_lock = threading.Lock()
         self.stats = {}
 
         self.node_key = node_key
         self.node_id = hashlib.sha256(node_key).hexdigest().encode()
         self.role = role
         self.sock.settimeout(60)
-        self.chunk_size = 131_072
-
-        # End of transmission + compression characters for the network messages.
-        self.EOT_CHAR = b"HELLOCHENQUI"
-        self.COMPR_CHAR = 0x02.to_bytes(16, "big")
 
     def compress(self, data):
         compressed = data
 
         try:
-            compressed = base64.b64encode(zlib.compress(data, 6))
+            compressed = zlib.compress(data, 6)
         except Exception as e:
             self.main_node.debug_print(f"compression-error: {e}")
 
         return compressed
 
     def decompress(self, data):
-        decompressed = base64.b64decode(data)
+        decompressed = data
 
         try:
-            decompressed = zlib.decompress(decompressed)
+            decompressed = zlib.decompress(data)
         except Exception as e:
             self.main_node.debug_print(f"decompression-error: {e}")
 
         return decompressed
 
-    def send(self, data: bytes, compression: bool = False):
+    def send(self, data, compression: bool = False):
+        """
+        Send a message framed by a 9 byte header (flags, payload length). Data may be a single
+        bytes-like object or a list of buffers, which are written with scatter-gather I/O
+        so that tags and payloads never have to be concatenated.
+        """
         try:
-            if compression:
-                data = self.compress(data)
-                if data is not None:
-                    for i in range(0, len(data), self.chunk_size):
-                        chunk = data[i : i + self.chunk_size]
-                        self.sock.sendall(chunk + self.COMPR_CHAR)
-                    self.sock.sendall(self.EOT_CHAR)
-            elif len(data) < self.chunk_size:
-                self.sock.sendall(data + self.EOT_CHAR)
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                buffers = [data]
             else:
-                for i in range(0, len(data), self.chunk_size):
-                    chunk = data[i : i + self.chunk_size]
-                    self.sock.sendall(chunk)
+                buffers = list(data)
+
+            flags = 0
+            if compression:
+                payload = b"".join(buffers)
+                compressed = self.compress(payload)
+
+                if compressed is not payload:
+                    buffers = [compressed]
+                    flags |= FLAG_COMPRESSED
+
+            buffers = [memoryview(b).cast("B") for b in buffers]
+            length = sum(len(b) for b in buffers)
+            buffers.insert(0, memoryview(HEADER.pack(flags, length)))
+
+            # Header and payload must go out back to back, or concurrent senders desync the framing
+            with self.send_lock:
+                self.send_buffers(buffers)
 
-                self.sock.sendall(self.EOT_CHAR)
         except Exception as e:
             self.main_node.debug_print(f"connection send error: {e}")
             self.stop()
 
-    def stop(self) -> None:
-        self.terminate_flag.set()
+    def send_buffers(self, buffers: list):
+        """Write all buffers to the socket, resuming after partial writes"""
+        buffers = [b for b in buffers if len(b) > 0]
 
-    def parse_packet(self, packet) -> Union[str, dict, bytes]:
-        if packet.find(self.COMPR_CHAR) == len(packet) - 1:
-            packet = self.decompress(packet[0:-1])
+        if not hasattr(self.sock, "sendmsg"):
+            for buffer in buffers:
+                self.sock.sendall(buffer)
+            return
 
-        return packet
+        while buffers:
+            sent = self.sock.sendmsg(buffers[:IOV_MAX])
 
-        # try:
-        #     packet_decoded = packet.decode()
-        #
-        #     try:
-        #         return json.loads(packet_decoded)
-        #     except json.decoder.JSONDecodeError:
-        #         return packet_decoded
-        #
-        # except UnicodeDecodeError:
-        #     return packet
+            # Drop fully written buffers and trim the partially written one
+            while sent > 0:
+                if sent >= len(buffers[0]):
+                    sent -= len(buffers[0])
+                    buffers.pop(0)
+                else:
+                    buffers[0] = buffers[0][sent:]
+                    sent = 0
+
+    def recv_exact(self, n: int, idle: bool = False) -> bytearray:
+        """
+        Read exactly n bytes into a buffer, which is returned without copying. If idle is set,
+        a timeout before any data has arrived is raised, otherwise we keep waiting for the rest
+        of the message.
+        """
+        buffer = bytearray(min(n, RECV_BUFFER_SIZE))
+        received = 0
+
+        while received < n:
+            if received == len(buffer):
+                # Double the buffer only once it is full, so a bogus header length is never
+                # allocated up front
+                buffer.extend(bytes(min(len(buffer), n - len(buffer))))
 
-    def run(self):
-        buffer = b""
-        b_size = 0
+            try:
+                with memoryview(buffer)[received:] as view:
+                    n_bytes = self.sock.recv_into(view)
+            except socket.timeout:
+                if (idle and received == 0) or self.terminate_flag.is_set():
+                    raise
+                continue
 
-        while not self.terminate_flag.is_set():
-            chunk = b""
+            if n_bytes == 0:
+                raise ConnectionError("connection closed by peer")
+
+            received += n_bytes
+
+        return buffer
 
+    def stop(self) -> None:
+        self.terminate_flag.set()
+
+    def run(self):
+        while not self.terminate_flag.is_set():
             try:
-                chunk = self.sock.recv(1_000_000)
+                flags, length = HEADER.unpack(self.recv_exact(HEADER.size, idle=True))
+
+                if length > MAX_MESSAGE_SIZE:
+                    raise ValueError(f"message length {length} exceeds limit")
+
+                data = self.recv_exact(length)
+
             except socket.timeout:
                 self.main_node.debug_print(f"connection timeout")
+                continue
+
             except Exception as e:
                 self.terminate_flag.set()
                 self.main_node.debug_print(f"unexpected error: {e}")
+                break
 
-            if chunk != b"":
-                eot_pos = chunk.find(self.EOT_CHAR)
-                file_name = f"streamed_data_{self.host}_{self.port}_{self.main_node.host}_{self.main_node.port}"
-
-                # We have reached the end of one nodes processing
-                if eot_pos > 0:
-                    packet = buffer + chunk[:eot_pos]
-                    try:
-                        with open(file_name, "ab") as f:
-                            f.write(packet)
-                            buffer = b""
-                            b_size = 0
-
-                        self.main_node.handle_message(self, b"DONE STREAM")
+            if flags & FLAG_COMPRESSED:
+                data = self.decompress(data)
 
-                    except Exception as e:
-                        raise e
-
-                elif len(buffer) > 40_000_000:
-                    try:
-                        with open(file_name, "ab") as f:
-                            b_size += len(buffer)
-                            f.write(buffer)
-                            buffer = chunk
-
-                    except Exception as e:
-                        raise e
-
-                else:
-                    buffer += chunk
+            self.main_node.handle_message(self, data)
 
         self.sock.settimeout(None)
         self.sock.close()
@@ -156,7 +189,6 @@ class Connection(threading.Thread):
     Connection thread between two nodes that are able to send/stream data from/to
     the connected node.
 
-    TODO
-        Send message size before to prepare accordingly.
-        Switch between saving bytes to loading directly based on packet size.
+    Messages are framed by a fixed header: 1 byte of flags followed by the 8 byte
+    (big-endian) payload length.
     """
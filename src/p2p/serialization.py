@@ -0,0 +1,142 @@
+import torch.nn as nn
+import pickle
+import struct
+import torch
+import io
+
+
+# Frame prefix for tensor messages: pickle length (8 bytes) + number of out-of-band buffers (4 bytes),
+# followed by the padding and length (8 bytes each) of every buffer
+FRAME = struct.Struct(">QI")
+
+# Out-of-band buffers are padded to start at a multiple of this from the start of the message
+BUFFER_ALIGNMENT = 64
+_PADDING = bytes(BUFFER_ALIGNMENT)
+
+# Minimum number of elements before a downcast fp32 tensor is actually sent as bf16
+HALF_PRECISION_THRESHOLD = 4096
+
+
+def rebuild_tensor(
+    buffer, dtype, shape, device, requires_grad, parameter, wire_dtype=None
+):
+    """Rebuild a tensor from its raw out-of-band storage bytes (sent as wire_dtype if downcast)"""
+    if len(buffer) == 0:
+        tensor = torch.empty(shape, dtype=dtype)
+    else:
+        # Alias the receive buffer directly, only read-only buffers (e.g. decompressed
+        # messages) are copied into writable storage first
+        if memoryview(buffer).readonly:
+            buffer = bytearray(buffer)
+
+        tensor = torch.frombuffer(buffer, dtype=torch.uint8)
+        tensor = tensor.view(wire_dtype or dtype).reshape(shape)
+
+    tensor = tensor.to(device=device, dtype=dtype)
+
+    if parameter:
+        return nn.Parameter(tensor, requires_grad=requires_grad)
+
+    return tensor.requires_grad_(requires_grad)
+
+
+class TensorPickler(pickle.Pickler):
+    """
+    Pickler that hands dense tensor storage to the buffer callback (PEP 574) rather than
+    copying it into the pickle stream, leaving only dtype/shape metadata in-band. Large fp32
+    tensors listed in downcast are sent as bf16 and cast back on arrival.
+    """
+
+    def __init__(self, *args, downcast=(), **kwargs):
+        super(TensorPickler, self).__init__(*args, **kwargs)
+        self.downcast_ids = {id(tensor) for tensor in downcast}
+
+    def reducer_override(self, obj):
+        if (
+            type(obj) not in (torch.Tensor, nn.Parameter)
+            or obj.layout != torch.strided
+            or obj.is_quantized
+        ):
+            return NotImplemented
+
+        tensor = obj.detach()
+        wire_dtype = None
+
+        if (
+            id(obj) in self.downcast_ids
+            and tensor.dtype == torch.float32
+            and tensor.numel() >= HALF_PRECISION_THRESHOLD
+        ):
+            # Cast on the source device, so only the bf16 copy is moved to the host
+            wire_dtype = torch.bfloat16
+            tensor = tensor.to(wire_dtype)
+
+        tensor = tensor.contiguous().cpu()
+        raw = tensor.reshape(-1).view(torch.uint8).numpy()
+
+        return rebuild_tensor, (
+            pickle.PickleBuffer(raw),
+            obj.dtype,
+            tuple(obj.shape),
+            str(obj.device),
+            obj.requires_grad,
+            type(obj) is nn.Parameter,
+            wire_dtype,
+        )
+
+
+def dumps_tensors(obj, tag: bytes = b"", downcast=()) -> list:
+    """
+    Pickle obj with protocol 5, returning a list of buffers [tag, frame, pickle, *tensor buffers]
+    to be sent without concatenation. Tensor storage is referenced, not copied, and padded to
+    BUFFER_ALIGNMENT from the start of the message (the tag). Tensors in downcast (matched by
+    identity) may be sent as bf16, see HALF_PRECISION_THRESHOLD.
+    """
+    buffers = []
+    stream = io.BytesIO()
+    TensorPickler(
+        stream,
+        protocol=5,
+        buffer_callback=buffers.append,
+        downcast=downcast,
+    ).dump(obj)
+    pickled = stream.getvalue()
+
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    offset = len(tag) + FRAME.size + 16 * len(raw_buffers) + len(pickled)
+    layout = []
+    padded_buffers = []
+
+    for buffer in raw_buffers:
+        padding = -offset % BUFFER_ALIGNMENT
+        offset += padding + len(buffer)
+        layout += [padding, len(buffer)]
+        padded_buffers += [memoryview(_PADDING)[:padding], buffer]
+
+    frame = FRAME.pack(len(pickled), len(raw_buffers)) + struct.pack(
+        f">{len(layout)}Q", *layout
+    )
+
+    return [tag, frame, pickled] + padded_buffers
+
+
+def loads_tensors(data):
+    """
+    Inverse of dumps_tensors, data is a bytes-like object holding the concatenated buffers
+    from the frame onwards (i.e. the message without its tag)
+    """
+    data = memoryview(data)
+    pickle_len, n_buffers = FRAME.unpack_from(data)
+    layout = struct.unpack_from(f">{2 * n_buffers}Q", data, FRAME.size)
+
+    offset = FRAME.size + 16 * n_buffers
+    pickled = data[offset : offset + pickle_len]
+    offset += pickle_len
+
+    buffers = []
+    for padding, length in zip(layout[::2], layout[1::2]):
+        offset += padding
+        buffers.append(data[offset : offset + length])
+        offset += length
+
+    return pickle.loads(pickled, buffers=buffers)
@@ -3,7 +3,7 @@ from src.p2p.connection import Connection
 
 from logging.handlers import TimedRotatingFileHandler
 from dotenv import load_dotenv
-from typing import Callable
+from typing import Callable, Union
 from miniupnpc import UPnP
 from web3 import Web3
 import threading
@@ -188,20 +188,8 @@ class SmartNode(threading.Thread):
             # received, but we don't have the context
             ghost = 0
 
-            # Larger data streams are stored in secondary storage during streaming to improve efficiency
-            if b"DONE STREAM" == data[:11]:
-                file_name = (
-                    f"streamed_data_{node.host}_{node.port}_{self.host}_{self.port}"
-                )
-
-                with open(file_name, "rb") as file:
-                    streamed_bytes = file.read()
-
-                self.handle_data(streamed_bytes, node)
-                os.remove(file_name)
-
             # We received a ping, send a pong
-            elif b"PING" == data[:4]:
+            if b"PING" == data[:4]:
                 self.update_node_stats(node.node_id, "PING")
                 self.send_to_node(node, b"PONG")
 
@@ -226,7 +214,7 @@ class SmartNode(threading.Thread):
                     pass
 
                 elif node.node_id in self.requests:
-                    value_id = data[22:86]
+                    value_id = bytes(data[22:86])
 
                     # We have received data that we have requested
                     if value_id in self.requests[node.node_id]:
@@ -253,8 +241,8 @@ class SmartNode(threading.Thread):
                     # TODO not enough data received!
                     pass
                 else:
-                    value_hash = data[13:77]
-                    requester = data[77:141]
+                    value_hash = bytes(data[13:77])
+                    requester = bytes(data[77:141])
 
                     # Get node info
                     validator_info = self.query_dht(value_hash, requester)
@@ -844,9 +832,9 @@ class SmartNode(threading.Thread):
         return True
 
     def send_to_node(
-        self, n: Connection, data: bytes, compression: bool = False
+        self, n: Connection, data: Union[bytes, list], compression: bool = False
     ) -> None:
-        """Send data to a connected node"""
+        """Send data to a connected node, data may be a list of buffers to send without concatenating"""
         if n in self.nodes.values():
             n.send(data, compression=compression)
         else:
@@ -1,11 +1,12 @@
 from src.ml.model_analyzer import get_gpu_memory
 from src.p2p.smart_node import SmartNode
 from src.p2p.connection import Connection
+from src.p2p.serialization import dumps_tensors, loads_tensors
 
 import torch.optim as optim
 import torch.nn as nn
-import pickle
 import queue
+import torch
 
 
 class TorchNode(SmartNode):
@@ -15,6 +16,7 @@ class TorchNode(SmartNode):
         max_connections: int = 0,
         upnp=True,
         off_chain_test=False,
+        half_precision: bool = True,
     ):
         super(TorchNode, self).__init__(
             debug=debug,
@@ -33,6 +35,12 @@ class TorchNode(SmartNode):
         self.state_updates = {}
         self.distributed_graph = {}
 
+        # Incoming forward/backward passes for hosted modules: (kind, module_id, (tag, tensor))
+        self.work_queue = queue.SimpleQueue()
+
+        # Send large fp32 activations/gradients as bf16 in forward and backward passes
+        self.half_precision = half_precision
+
         # Master flag for handling different types of storage as master
         self.master = False
 
@@ -43,7 +51,7 @@ class TorchNode(SmartNode):
 
             if not handled:
                 if b"LOADED" == data[:6]:
-                    pickled = data[6:]
+                    pickled = bytes(data[6:])
                     self.debug_print(
                         f"Successfully offloaded submodule to: {node.node_id}"
                     )
@@ -55,16 +63,20 @@ class TorchNode(SmartNode):
 
                     if self.master:
                         # TODO we must check that the forward received corresponds to a sent pass/specific module
-                        [n_iter, n_micro, module_id], tensor = pickle.loads(data[7:])
+                        [n_iter, n_micro, module_id], tensor = loads_tensors(
+                            memoryview(data)[7:]
+                        )
                         self.modules["Master"].forward_queues[n_micro].put(
                             ([n_iter, n_micro, module_id], tensor)
                         )
 
                     # TODO we must check that the forward received corresponds to a sent pass/specific module
                     elif self.modules:
-                        (n_iter, n_micro, module_id), tensor = pickle.loads(data[7:])
-                        self.modules[module_id].forward_queues.put(
-                            ([n_iter, n_micro], tensor)
+                        (n_iter, n_micro, module_id), tensor = loads_tensors(
+                            memoryview(data)[7:]
+                        )
+                        self.work_queue.put(
+                            ("forward", module_id, ([n_iter, n_micro], tensor))
                         )
 
                 elif b"BACKWARD" == data[:8]:
@@ -75,16 +87,20 @@ class TorchNode(SmartNode):
 
                     # Master-specific handling (ie for DistributedModel)
                     if self.master:
-                        [n_iter, n_micro, module_id], tensor = pickle.loads(data[8:])
+                        [n_iter, n_micro, module_id], tensor = loads_tensors(
+                            memoryview(data)[8:]
+                        )
                         self.modules["Master"].backward_queues[n_micro].put(
                             ([n_iter, n_micro, module_id], tensor)
                         )
 
                     # Module-specific handling (ie for OffloadedModule / nn.Module)
                     elif self.modules:
-                        (n_iter, n_micro, module_id), tensor = pickle.loads(data[8:])
-                        self.modules[module_id].backward_queues.put(
-                            ([n_iter, n_micro], tensor)
+                        (n_iter, n_micro, module_id), tensor = loads_tensors(
+                            memoryview(data)[8:]
+                        )
+                        self.work_queue.put(
+                            ("backward", module_id, ([n_iter, n_micro], tensor))
                         )
 
                 # Handle requests for module parameters
@@ -92,7 +108,7 @@ class TorchNode(SmartNode):
                     self.debug_print(f"RECEIVED PARAMS REQUEST")
 
                     # TODO Must ensure requesting node is indeed the master or an overseeing validator
-                    module_id = data[10:]
+                    module_id = bytes(data[10:])
                     self.send_parameters(
                         node, self.modules[module_id].parameters(), module_id
                     )
@@ -102,7 +118,7 @@ class TorchNode(SmartNode):
                 # Handle and store responses from a parameters request
                 elif b"PARAMETERS" == data[:10]:
                     self.debug_print(f"RECEIVED PARAMS REQUEST")
-                    module_id, parameters = pickle.loads(data[10:])
+                    module_id, parameters = loads_tensors(memoryview(data)[10:])
                     self.parameters[module_id] = parameters
 
                 # elif b"MODULE" == data[:6]:
@@ -135,28 +151,58 @@ class TorchNode(SmartNode):
         except Exception as e:
             self.debug_print(f"handle_data: Error handling data: {e}")
 
+    def downcast_tensors(self, args) -> tuple:
+        """
+        The activation/gradient tensor of a forward/backward payload, the only tensor that may
+        be sent as bf16. Masks and other kwargs are always sent at full precision.
+        """
+        if not self.half_precision:
+            return ()
+
+        # Unwrap (args, kwargs) and huggingface outputs down to the hidden state tensor
+        while not isinstance(args, torch.Tensor):
+            if hasattr(args, "last_hidden_state"):
+                args = args.last_hidden_state
+            elif isinstance(args, (tuple, list)) and len(args) > 0:
+                args = args[0]
+            else:
+                return ()
+
+        return (args,)
+
     def send_forward(self, node: Connection, args, context):
         """Send forward pass to node, must contain args (module args) and context (module + epoch id)"""
-        pickled_data = b"FORWARD" + pickle.dumps((context, args))
-        self.send_to_node(node, pickled_data)
+        self.send_to_node(
+            node,
+            dumps_tensors(
+                (context, args), tag=b"FORWARD", downcast=self.downcast_tensors(args)
+            ),
+        )
 
     def send_backward(self, node: Connection, args, context):
         """Send backward pass to node, must contain args (module args) and context (module + epoch id)"""
-        pickled_data = b"BACKWARD" + pickle.dumps((context, args))
-        self.send_to_node(node, pickled_data)
+        self.send_to_node(
+            node,
+            dumps_tensors(
+                (context, args), tag=b"BACKWARD", downcast=self.downcast_tensors(args)
+            ),
+        )
 
     def send_parameters(self, node: Connection, parameters, module_id):
         """Send specific module parameters
         TODO should be accompanied by a requested proof (from smart contract) or the specific user
         """
-        pickled_data = b"PARAMETERS" + pickle.dumps((module_id, list(parameters)))
-        self.send_to_node(node, pickled_data)
+        self.send_to_node(
+            node, dumps_tensors((module_id, list(parameters)), tag=b"PARAMETERS")
+        )
 
     def send_parameters_req(self, node: Connection, module_id):
         """Request parameters from a specific worker"""
         self.send_to_node(node, b"PARAMS-REQ" + module_id)
 
     def send_module(self, module: nn.Module, node: Connection):
-        module_bytes = pickle.dumps(module)
-        self.debug_print(f"Sending module: {len(module_bytes)} to worker: {node.node_id}")
-        self.send_to_node(node, b"MODULE" + module_bytes)
+        # Parameters and buffers are sent out-of-band straight from their storage
+        module_buffers = dumps_tensors(module, tag=b"MODULE")
+        module_size = sum(memoryview(buffer).nbytes for buffer in module_buffers)
+        self.debug_print(f"Sending module: {module_size} to worker: {node.node_id}")
+        self.send_to_node(node, module_buffers)
@@ -3,7 +3,7 @@ from src.ml.model_analyzer import *
 from src.p2p.connection import Connection
 from src.p2p.torch_node import TorchNode
 from src.p2p.node_api import *
-from src.cryptography.rsa import get_rsa_pub_key
+from src.cryptography.rsa import get_rsa_pub_key, generate_rsa_key_pair_async
 
 from web3.exceptions import ContractLogicError
 import torch.nn as nn
@@ -24,12 +24,17 @@ class User(TorchNode):
         upnp=True,
         off_chain_test=False,
         private_key=None,
+        half_precision: bool = True,
     ):
+        # Generate our RSA keys in the background while the node starts up
+        generate_rsa_key_pair_async(b"U")
+
         super(User, self).__init__(
             debug=debug,
             max_connections=max_connections,
             upnp=upnp,
             off_chain_test=off_chain_test,
+            half_precision=half_precision,
         )
 
         self.role = b"U"
@@ -81,7 +86,7 @@ class User(TorchNode):
                 if b"ACCEPT-JOB" == data[:10]:
                     if node.node_id in self.jobs[-1]["seed_validators"]:
                         self.debug_print(f"Validator ({node.node_id}) accepted job!")
-                        job_id = data[10:74]
+                        job_id = bytes(data[10:74])
                         distribution = pickle.loads(data[74:])
 
                         for mod_id, worker_info in distribution:
@@ -101,7 +106,7 @@ class User(TorchNode):
 
                     elif b"LOADED" == data[:6]:
                         self.debug_print(f"Successfully offloaded submodule to worker.")
-                        pickled = data[6:]
+                        pickled = bytes(data[6:])
                         self.distributed_graph[pickled] = node
                     else:
                         ghost += 1
@@ -321,6 +326,7 @@ class User(TorchNode):
         ids: list = None,
         handle_layers=False,
         handled_layer=False,
+        memory: dict = None,
     ) -> dict:
         """
         Parse model based on some minimum submodule size and return a config file containing the
@@ -331,6 +337,9 @@ class User(TorchNode):
             config = {}
         if ids is None:
             ids = []
+        if memory is None:
+            # Size every submodule up front so recursive calls are lookups
+            memory = estimate_memory_tree(model)
 
         # Create offloaded module data structure for config file
         def create_offloaded(module: nn.Module, module_index: list, module_size: int):
@@ -365,18 +374,20 @@ class User(TorchNode):
             return module_id, data
 
         named_children = list(model.named_children())
-        model_size = estimate_memory(model)
 
         # If we do not want to handle initial layers and model can fit on worker
-        if handle_layers is False and model_size <= max_module_size:
-            k, v = create_offloaded(model, [-1], model_size)
-            config[k] = v
+        if handle_layers is False:
+            model_size = memory[model]
+
+            if model_size <= max_module_size:
+                k, v = create_offloaded(model, [-1], model_size)
+                config[k] = v
 
         # Break first model into children
         for i in range(len(named_children)):
             # Unpack module info
             name, submodule = named_children[i]
-            module_memory = estimate_memory(submodule)
+            module_memory = memory[submodule]
 
             # Update current module id
             new_ids = ids + [i]
@@ -402,6 +413,7 @@ class User(TorchNode):
                         new_ids,
                         True,
                         False,
+                        memory,
                     )
                     k, v = create_loaded(submodule, new_ids, module_memory)
                     v["subconfig"] = sub_config
@@ -416,7 +428,7 @@ class User(TorchNode):
             # Recursively break down model if too large
             else:
                 sub_config = self.parse_model(
-                    submodule, max_module_size, config, new_ids, True, True
+                    submodule, max_module_size, config, new_ids, True, True, memory
                 )
                 k, v = create_loaded(submodule, new_ids, module_memory)
                 v["subconfig"] = sub_config
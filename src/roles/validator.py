@@ -1,6 +1,6 @@
 from src.p2p.torch_node import TorchNode
 from src.p2p.connection import Connection
-from src.cryptography.rsa import get_rsa_pub_key
+from src.cryptography.rsa import get_rsa_pub_key, generate_rsa_key_pair_async
 
 import threading
 import hashlib
@@ -34,6 +34,9 @@ class Validator(TorchNode):
         off_chain_test=False,
         private_key=None,
     ):
+        # Generate our RSA keys in the background while the node starts up
+        generate_rsa_key_pair_async(b"V")
+
         super(Validator, self).__init__(
             debug=debug,
             max_connections=max_connections,
@@ -68,8 +71,8 @@ class Validator(TorchNode):
             if not handled:
                 # Job acceptance from worker
                 if b"ACCEPT-JOB" == data[:10]:
-                    job_id = data[10:74]
-                    module_id = data[74:148]
+                    job_id = bytes(data[10:74])
+                    module_id = bytes(data[74:148])
 
                     if (
                         node.node_id in self.requests
@@ -1,7 +1,8 @@
 from src.p2p.torch_node import TorchNode
 from src.p2p.connection import Connection
+from src.p2p.serialization import loads_tensors
 from src.ml.model_analyzer import estimate_memory, handle_output, get_gpu_memory
-from src.cryptography.rsa import get_rsa_pub_key
+from src.cryptography.rsa import get_rsa_pub_key, generate_rsa_key_pair_async
 
 import torch.nn as nn
 import torch.optim as optim
@@ -32,12 +33,17 @@ class Worker(TorchNode):
         upnp=True,
         off_chain_test=False,
         public_key=None,
+        half_precision: bool = True,
     ):
+        # Generate our RSA keys in the background while the node starts up
+        generate_rsa_key_pair_async(b"W")
+
         super(Worker, self).__init__(
             debug=debug,
             max_connections=max_connections,
             upnp=upnp,
             off_chain_test=off_chain_test,
+            half_precision=half_precision,
         )
 
         self.training = False
@@ -73,7 +79,9 @@ class Worker(TorchNode):
                     )
                     # Master-specific handling (ie for DistributedModel)
                     if self.master:
-                        [n_iter, n_micro, module_id], tensor = pickle.loads(data[7:])
+                        [n_iter, n_micro, module_id], tensor = loads_tensors(
+                            memoryview(data)[7:]
+                        )
                         self.modules["Master"].forward_queues[n_micro].put(
                             ([n_iter, n_micro, module_id], tensor)
                         )
@@ -82,9 +90,11 @@ class Worker(TorchNode):
 
                     # Module-specific handling (ie for OffloadedModule / nn.Module)
                     elif self.training and len(self.modules) > 0:
-                        (n_iter, n_micro, module_id), tensor = pickle.loads(data[7:])
-                        self.modules[module_id].forward_queues.put(
-                            ([n_iter, n_micro], tensor)
+                        (n_iter, n_micro, module_id), tensor = loads_tensors(
+                            memoryview(data)[7:]
+                        )
+                        self.work_queue.put(
+                            ("forward", module_id, ([n_iter, n_micro], tensor))
                         )
 
                         return True
@@ -97,7 +107,9 @@ class Worker(TorchNode):
 
                     # Master-specific handling (ie for DistributedModel)
                     if self.master:
-                        [n_iter, n_micro, module_id], tensor = pickle.loads(data[8:])
+                        [n_iter, n_micro, module_id], tensor = loads_tensors(
+                            memoryview(data)[8:]
+                        )
                         self.modules["Master"].backward_queues[n_micro].put(
                             ([n_iter, n_micro, module_id], tensor)
                         )
@@ -106,9 +118,11 @@ class Worker(TorchNode):
 
                     # Module-specific handling (ie for OffloadedModule / nn.Module)
                     elif self.training and self.modules:
-                        (n_iter, n_micro, module_id), tensor = pickle.loads(data[8:])
-                        self.modules[module_id].backward_queues.put(
-                            ([n_iter, n_micro], tensor)
+                        (n_iter, n_micro, module_id), tensor = loads_tensors(
+                            memoryview(data)[8:]
+                        )
+                        self.work_queue.put(
+                            ("backward", module_id, ([n_iter, n_micro], tensor))
                         )
 
                         return True
@@ -118,7 +132,7 @@ class Worker(TorchNode):
                     self.debug_print(f"RECEIVED PARAMS REQUEST")
                     if self.training:
                         # Must ensure requesting node is indeed the master or an overseeing validator
-                        module_id = data[9:]
+                        module_id = bytes(data[9:])
                         self.send_parameters(
                             node, self.modules[module_id].parameters(), module_id
                         )
@@ -128,7 +142,7 @@ class Worker(TorchNode):
                 # Handle and store responses from a parameters request
                 elif b"PARAMETERS" == data[:10]:
                     self.debug_print(f"RECEIVED PARAMS REQUEST")
-                    module_id, parameters = pickle.loads(data[10:])
+                    module_id, parameters = loads_tensors(memoryview(data)[10:])
                     self.parameters[module_id] = parameters
 
                     return True
@@ -139,7 +153,7 @@ class Worker(TorchNode):
                     if self.training:
                         # Must ensure requesting node is the master
                         mode = False if data[6:7] == b"0" else True
-                        module_id = data[7:]
+                        module_id = bytes(data[7:])
                         self.modules[module_id].training = mode
                         self.send_train_updated(node, mode, module_id)
 
@@ -149,7 +163,7 @@ class Worker(TorchNode):
                 elif b"TU-REQ" == data[:6]:
                     if self.master or self.training:
                         mode = False if data[6:7] == b"0" else True
-                        module_id = data[7:]
+                        module_id = bytes(data[7:])
                         if module_id in self.state_updates.keys():
                             self.state_updates[module_id]["train"] = mode
                         else:
@@ -214,10 +228,8 @@ class Worker(TorchNode):
                     # Must confirm the model with a job on SC
                     if self.training:
                         # Load in model
-                        module = pickle.loads(data[6:])
+                        module = loads_tensors(memoryview(data)[6:])
 
-                        module.forward_queues = queue.Queue()
-                        module.backward_queues = queue.Queue()
                         module.intermediates = {}
                         # module.intermediates = queue.LifoQueue()
 
@@ -294,60 +306,64 @@ class Worker(TorchNode):
 
     def train_loop(self):
         if self.training:
-            # Complete outstanding forward and backward passes
-            for module_id, module in self.modules.items():
-                # Complete any outstanding back propagations
-                if module.backward_queues.empty() is False:
-                    next_node = list(self.nodes.values())[
-                        0
-                    ]  # Placeholder for the connecting node
-
-                    # Grab backwards pass from forward node and our associated input/output from forward pass
-                    tag, loss_relay = module.backward_queues.get()
-                    inter_tag = tuple(tag)
-                    assoc_input, assoc_output = module.intermediates[inter_tag]
-
-                    # Continue backwards pass on our section of model
-                    assoc_output.backward(
-                        loss_relay, retain_graph=True
-                    )  # Do we need retain graph?
-                    dvalues = assoc_input.grad
-
-                    tag.append(module_id)
-
-                    # Pass along backwards pass to next node
-                    self.send_backward(next_node["connection"], dvalues, tag)
-                    self.optimizers[module_id].zero_grad()
-                    self.optimizers[module_id].step()
-
-                if module.forward_queues.empty() is False:
-                    next_node = list(self.nodes.values())[
-                        0
-                    ]  # Placeholder for the appropriate node
-
-                    tag, tensor = module.forward_queues.get()
-
-                    # Unpack queued forward pass unpack values (eg. mask, stride...)
-                    if isinstance(tensor, tuple):
-                        args, kwargs = tensor
-                    else:
-                        args = tensor
-                        kwargs = {}
-
-                    # Clear tensor of any previous info, set up for custom backward pass
-                    inp = (
-                        handle_output(args).clone().detach().requires_grad_()
-                    )  # This should be done on sending node, not receiving
-                    out = module(inp, **kwargs)
-
-                    inter_tag = tuple(tag)
-                    tag.append(module_id)
-
-                    # Store output and input tensor for backward pass
-                    module.intermediates[inter_tag] = [inp, handle_output(out)]
-
-                    # Relay forward pass to the next node
-                    self.send_forward(next_node["connection"], out, tag)
+            # Block until a forward or backward pass arrives for one of our modules
+            try:
+                kind, module_id, (tag, tensor) = self.work_queue.get(timeout=0.1)
+            except queue.Empty:
+                return
+
+            module = self.modules[module_id]
+
+            # Complete any outstanding back propagations
+            if kind == "backward":
+                next_node = list(self.nodes.values())[
+                    0
+                ]  # Placeholder for the connecting node
+
+                # Grab our associated input/output from forward pass
+                loss_relay = tensor
+                inter_tag = tuple(tag)
+                assoc_input, assoc_output = module.intermediates[inter_tag]
+
+                # Continue backwards pass on our section of model
+                assoc_output.backward(
+                    loss_relay, retain_graph=True
+                )  # Do we need retain graph?
+                dvalues = assoc_input.grad
+
+                tag.append(module_id)
+
+                # Pass along backwards pass to next node
+                self.send_backward(next_node["connection"], dvalues, tag)
+                self.optimizers[module_id].zero_grad()
+                self.optimizers[module_id].step()
+
+            elif kind == "forward":
+                next_node = list(self.nodes.values())[
+                    0
+                ]  # Placeholder for the appropriate node
+
+                # Unpack queued forward pass unpack values (eg. mask, stride...)
+                if isinstance(tensor, tuple):
+                    args, kwargs = tensor
+                else:
+                    args = tensor
+                    kwargs = {}
+
+                # Clear tensor of any previous info, set up for custom backward pass
+                inp = (
+                    handle_output(args).clone().detach().requires_grad_()
+                )  # This should be done on sending node, not receiving
+                out = module(inp, **kwargs)
+
+                inter_tag = tuple(tag)
+                tag.append(module_id)
+
+                # Store output and input tensor for backward pass
+                module.intermediates[inter_tag] = [inp, handle_output(out)]
+
+                # Relay forward pass to the next node
+                self.send_forward(next_node["connection"], out, tag)
 
     def proof_of_learning(self, dummy_input: torch.Tensor):
         proof = {
@@ -0,0 +1,84 @@
+from src.cryptography.rsa import (
+    decrypt,
+    encrypt,
+    generate_rsa_key_pair,
+    generate_rsa_key_pair_async,
+    get_rsa_pub_key,
+    load_private_key,
+)
+from cryptography.exceptions import InvalidTag
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import pytest
+import os
+
+
+def read_key_files(role):
+    path = os.path.join("keys", role.decode())
+    with open(os.path.join(path, "private_key.pem"), "rb") as f:
+        private_pem = f.read()
+    with open(os.path.join(path, "public_key.pem"), "rb") as f:
+        public_pem = f.read()
+    return private_pem, public_pem
+
+
+@pytest.fixture(autouse=True)
+def keys_dir(tmp_path, monkeypatch):
+    """Keys are stored relative to the working directory"""
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.parametrize("size", [0, 16, 190, 191, 100_000])
+def test_encrypt_decrypt_round_trip(size):
+    data = os.urandom(size)
+    public_key = get_rsa_pub_key(b"T", b=True)
+
+    assert decrypt(encrypt(data, b"T"), b"T") == data
+    assert decrypt(encrypt(data, b"T", pub_key=public_key), b"T") == data
+
+
+def test_tampered_ciphertext_raises():
+    encrypted = bytearray(encrypt(b"secret" * 100, b"T"))
+    encrypted[-1] ^= 1
+
+    with pytest.raises(InvalidTag):
+        decrypt(bytes(encrypted), b"T")
+
+
+def test_concurrent_key_generation_is_consistent():
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(4, mp_context=context) as executor:
+        list(executor.map(generate_rsa_key_pair, [b"C"] * 8))
+
+    public_pem = read_key_files(b"C")[1]
+
+    assert sorted(os.listdir(os.path.join("keys", "C"))) == [
+        "private_key.pem",
+        "public_key.pem",
+    ]
+    assert decrypt(encrypt(b"hello", b"C", pub_key=public_pem), b"C") == b"hello"
+
+
+def test_missing_public_key_is_restored():
+    generate_rsa_key_pair(b"R")
+    private_pem, public_pem = read_key_files(b"R")
+    os.remove(os.path.join("keys", "R", "public_key.pem"))
+
+    assert decrypt(encrypt(b"hello", b"R"), b"R") == b"hello"
+    assert read_key_files(b"R") == (private_pem, public_pem)
+
+
+def test_empty_private_key_is_replaced():
+    os.makedirs(os.path.join("keys", "E"))
+    open(os.path.join("keys", "E", "private_key.pem"), "wb").close()
+    generate_rsa_key_pair(b"E")
+
+    assert load_private_key(b"E").key_size == 2048
+    assert decrypt(encrypt(b"hello", b"E"), b"E") == b"hello"
+
+
+def test_async_key_generation():
+    generate_rsa_key_pair_async(b"A").wait(timeout=60)
+    public_pem = read_key_files(b"A")[1]
+
+    assert decrypt(encrypt(b"hello", b"A", pub_key=public_pem), b"A") == b"hello"
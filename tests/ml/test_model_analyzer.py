@@ -0,0 +1,27 @@
+from src.ml.model_analyzer import estimate_memory, estimate_memory_tree
+import torch.nn as nn
+
+
+def test_estimate_memory_tree_matches_estimate_memory():
+    model = nn.Sequential(
+        nn.Linear(8, 16), nn.Sequential(nn.ReLU(), nn.Linear(16, 4)), nn.Linear(4, 2)
+    )
+    memory = estimate_memory_tree(model)
+
+    for module in model.modules():
+        assert memory[module] == estimate_memory(module)
+
+
+def test_estimate_memory_tree_tied_weights():
+    embedding = nn.Embedding(10, 4)
+    head = nn.Linear(4, 10, bias=False)
+    head.weight = embedding.weight
+    shared = nn.Linear(4, 4)
+
+    model = nn.Sequential(
+        embedding, nn.Sequential(shared, nn.Tanh()), nn.Sequential(shared, head)
+    )
+    memory = estimate_memory_tree(model)
+
+    for module in model.modules():
+        assert memory[module] == estimate_memory(module)
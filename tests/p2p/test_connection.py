@@ -0,0 +1,78 @@
+from src.p2p.serialization import dumps_tensors, loads_tensors, BUFFER_ALIGNMENT
+from src.p2p.connection import Connection
+import threading
+import socket
+import pytest
+import queue
+import torch
+
+
+class DummyNode:
+    def __init__(self):
+        self.messages = queue.Queue()
+
+    def debug_print(self, message):
+        pass
+
+    def handle_message(self, node, data):
+        self.messages.put(data)
+
+
+@pytest.fixture
+def connections():
+    """Sending connection and the node receiving its messages over a socket pair"""
+    node = DummyNode()
+    sock_a, sock_b = socket.socketpair()
+    sender = Connection(node, sock_a, "127.0.0.1", 0, 0, b"a", 0)
+    receiver = Connection(node, sock_b, "127.0.0.1", 0, 0, b"b", 0)
+    receiver.start()
+
+    yield sender, node
+
+    receiver.stop()
+    sender.stop()
+    sock_a.close()
+    receiver.join(timeout=90)
+
+
+def test_send_recv_buffers_and_compressed(connections):
+    sender, node = connections
+    tensor = torch.randn(64, 64)
+    sender.send(dumps_tensors(tensor, tag=b"FORWARD"))
+    sender.send(b"PING" * 1000, compression=True)
+
+    data = node.messages.get(timeout=5)
+    tensor_out = loads_tensors(memoryview(data)[7:])
+    base = torch.frombuffer(data, dtype=torch.uint8).data_ptr()
+
+    assert data[:7] == b"FORWARD"
+    assert torch.equal(tensor_out, tensor)
+    assert (tensor_out.data_ptr() - base) % BUFFER_ALIGNMENT == 0
+    assert node.messages.get(timeout=5) == b"PING" * 1000
+
+
+def test_concurrent_sends_keep_framing(connections):
+    sender, node = connections
+
+    def send_many(tag):
+        for _ in range(10):
+            sender.send([tag, bytes(100_000)])
+
+    threads = [threading.Thread(target=send_many, args=(b"%d" % i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for _ in range(40):
+        data = node.messages.get(timeout=5)
+        assert len(data) == 100_001 and not any(data[1:])
+
+
+def test_recv_buffer_grows_with_message(connections, monkeypatch):
+    monkeypatch.setattr("src.p2p.connection.RECV_BUFFER_SIZE", 1000)
+    sender, node = connections
+    payload = bytes(range(256)) * 400
+    sender.send(payload)
+
+    assert node.messages.get(timeout=5) == payload
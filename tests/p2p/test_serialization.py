@@ -0,0 +1,80 @@
+from src.p2p.serialization import (
+    dumps_tensors,
+    loads_tensors,
+    HALF_PRECISION_THRESHOLD,
+    BUFFER_ALIGNMENT,
+)
+import torch.nn as nn
+import torch
+
+
+def round_trip(obj, downcast=()):
+    return loads_tensors(bytearray(b"".join(dumps_tensors(obj, downcast=downcast))))
+
+
+def test_half_precision_downcast_and_restore():
+    large = torch.randn(HALF_PRECISION_THRESHOLD)
+    small = torch.randn(HALF_PRECISION_THRESHOLD - 1)
+    mask = torch.full((HALF_PRECISION_THRESHOLD,), torch.finfo(torch.float32).min)
+    large_out, small_out, mask_out = round_trip(
+        (large, small, mask), downcast=(large, small)
+    )
+
+    assert large_out.dtype == torch.float32
+    assert torch.equal(large_out, large.to(torch.bfloat16).float())
+    assert torch.equal(small_out, small)
+
+    # Tensors not listed in downcast (e.g. attention masks) are sent at full precision
+    assert torch.equal(mask_out, mask)
+
+
+def test_parameter_and_tensor():
+    parameter = nn.Parameter(torch.randn(3, 4))
+    tensor = torch.randn(3, 4, requires_grad=True)
+    parameter_out, tensor_out = round_trip([parameter, tensor])
+
+    assert type(parameter_out) is nn.Parameter and parameter_out.requires_grad
+    assert type(tensor_out) is torch.Tensor and tensor_out.requires_grad
+    assert torch.equal(parameter_out, parameter)
+    assert torch.equal(tensor_out, tensor)
+
+
+def test_empty_non_contiguous_and_scalar():
+    empty = torch.empty(0, 5)
+    non_contiguous = torch.arange(24, dtype=torch.float64).reshape(4, 6).t()[::2]
+    scalar = torch.tensor(7, dtype=torch.int32)
+    empty_out, non_contiguous_out, scalar_out = round_trip(
+        {"a": empty, "b": non_contiguous, "c": scalar}
+    ).values()
+
+    assert empty_out.shape == (0, 5)
+    assert torch.equal(non_contiguous_out, non_contiguous)
+    assert scalar_out.shape == () and torch.equal(scalar_out, scalar)
+
+
+def test_received_tensors_are_writable():
+    tensor = torch.randn(16)
+    out = loads_tensors(bytearray(b"".join(dumps_tensors(tensor))))
+    out += 1
+
+    assert torch.allclose(out, tensor + 1)
+
+
+def test_buffers_are_aligned_from_message_start():
+    tensors = [torch.randn(3), torch.arange(5, dtype=torch.int16), torch.randn(7, 2)]
+    message = bytearray(b"".join(dumps_tensors(tensors, tag=b"FORWARD")))
+    out = loads_tensors(memoryview(message)[7:])
+    base = torch.frombuffer(message, dtype=torch.uint8).data_ptr()
+
+    for tensor, tensor_out in zip(tensors, out):
+        assert (tensor_out.data_ptr() - base) % BUFFER_ALIGNMENT == 0
+        assert torch.equal(tensor_out, tensor)
+
+
+def test_module_with_tied_weights():
+    module = nn.Sequential(nn.Embedding(10, 4), nn.Linear(4, 10, bias=False))
+    module[1].weight = module[0].weight
+    out = round_trip(module)
+
+    assert out[0].weight is out[1].weight
+    assert torch.equal(out[0].weight, module[0].weight)